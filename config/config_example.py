@@ -13,6 +13,8 @@ HOSTS = [
         'host': '192.168.0.58',  # IP address or hostname
         'username': 'fio',       # SSH username
         'password': 'fio',       # SSH password (consider using SSH keys instead)
+        # 'key_filename': '~/.ssh/id_ed25519',  # SSH key, tried before the password
+        # 'key_passphrase': None,               # Passphrase for an encrypted key
         'command': 'sudo RADAR_DEBUG=1 seamless_dev_spi spi.mode="presence"',  # Command to run on the host
         'tag': 'Sentai',         # Display name for this host on the chart
     },
@@ -23,6 +25,19 @@ HOSTS = [
         'command': 'sudo RADAR_DEBUG=1 RADAR_SPI_SPEED=12000000 ./seamless_dev_spi spi.mode="presence"',  # Command to run on the host
         'tag': 'Raspberry Pi',   # Display name for this host on the chart
     },
+    # Set 'accept_env': True for hosts whose sshd allows AcceptEnv; leading
+    # NAME=value words of the command are then sent as SSH environment
+    # variables instead of being parsed by the remote shell.
+    # Several commands can share one SSH connection: list them under 'commands'
+    # (the radar command first, auxiliary health/version probes after it)
+    # instead of using 'command':
+    # {
+    #     'host': '192.168.0.97',
+    #     'username': 'rpi',
+    #     'password': 'infineon',
+    #     'commands': ['sudo seamless_dev_spi spi.mode="presence"', 'uptime'],
+    #     'tag': 'Sensor 3',
+    # },
     # Add more hosts as needed:
     # {
     #     'host': '192.168.0.100',
@@ -38,9 +53,23 @@ HOSTS = [
 # Graph settings
 GRAPH_CONFIG = {
     'max_points': 100,        # Maximum number of data points to display
-    'update_interval': 100,   # Graph update interval in milliseconds
+    'update_interval': 100,   # Data ingest interval in milliseconds
+    'render_interval': 200,   # Redraw interval in milliseconds
     'window_size': (12, 6),   # Graph window size (width, height)
 }
 
+# SSH connection pool settings (connections are shared per host/username/port)
+SSH_POOL_CONFIG = {
+    'max_per_host': 4,            # Idle connections kept open per host
+    'max_sessions_per_conn': 8,   # Command sessions multiplexed on one connection
+    'idle_timeout': 300,          # Close idle connections after this many seconds
+}
+
+# Stagger initial SSH connects: host i waits i * base + random(0, jitter) seconds
+CONNECT_STAGGER = {
+    'base': 0.25,     # Seconds between consecutive host connects
+    'jitter': 0.1,    # Random extra delay to avoid synchronized connects
+}
+
 # Logging settings
 LOG_LEVEL = 'INFO'  # DEBUG, INFO, WARNING, ERROR
@@ -39,9 +39,26 @@ HOSTS = [
 # Advanced graph settings for production monitoring
 GRAPH_CONFIG = {
     'max_points': 500,              # Keep more history for analysis
-    'update_interval': 50,          # Fast updates for real-time monitoring
+    'update_interval': 50,          # Fast ingest for real-time monitoring
+    'render_interval': 200,         # Redraw at 5 FPS; samples still arrive every 50 ms
     'window_size': (16, 8),         # Large window for detailed view
 }
 
+# Keep SSH connections open and shared between command sessions
+SSH_POOL_CONFIG = {
+    'max_per_host': 4,              # Idle connections kept open per host
+    'max_sessions_per_conn': 8,     # Command sessions multiplexed on one connection
+    'idle_timeout': 300,            # Close idle connections after 5 minutes
+    'keepalive': 30,                # Seconds between SSH keepalives, 0 = off (keeps NAT mappings open)
+    'keepalive_count_max': 3,       # Drop a connection after this many unanswered keepalives
+    # 'rcvbuf': 262144,             # Fixed TCP receive buffer (default: kernel autotuning)
+}
+
+# Stagger initial SSH connects: host i waits i * base + random(0, jitter) seconds
+CONNECT_STAGGER = {
+    'base': 0.25,     # Seconds between consecutive host connects
+    'jitter': 0.1,    # Random extra delay to avoid synchronized connects
+}
+
 # Production logging settings
 LOG_LEVEL = 'INFO'  # Detailed logging for production monitoring
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Configuration loading for radar distance monitoring.
+Imports config.py once, validates it and caches the result keyed by the
+file's path and modification time, so repeated lookups are a dict hit and
+an edited config.py is picked up on the next call.
+"""
+
+import os
+import re
+import sys
+import shlex
+import logging
+import importlib.util
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+from schema import ConnectStagger, GraphConfig, SSHPoolConfig, from_dict
+
+# Settings read from config.py (anything else in the file is ignored)
+CONFIG_SETTINGS = (
+    'HOSTS',
+    'GRAPH_CONFIG',
+    'LOG_LEVEL',
+    'ENABLE_FILE_LOGGING',
+    'SSH_POOL_CONFIG',
+    'CONNECT_STAGGER',
+)
+
+REQUIRED_HOST_KEYS = ('host', 'username')
+
+# String fields shared between many HOSTS entries (one interned copy each)
+INTERNED_HOST_FIELDS = ('host', 'username', 'password', 'command', 'tag')
+
+# Fields of the normalized per-host layout built at load time
+HOST_FIELDS = ('host', 'username', 'password', 'key_filename', 'key_passphrase',
+               'command', 'env', 'aux_commands', 'tag', 'port')
+
+# Leading NAME=value words of a command and characters that need the remote shell
+_ENV_ASSIGNMENT_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*=')
+_SHELL_SYNTAX_RE = re.compile(r'[|&;<>()$`\\*?~{}\[\]]')
+
+_cache: Dict[Tuple[str, int], dict] = {}
+
+
+def _import_config(path: str):
+    """Execute a config file and return the resulting module."""
+    spec = importlib.util.spec_from_file_location("config", path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return config
+
+
+def validate_hosts(hosts) -> None:
+    """Check the HOSTS list, raising ValueError on the first problem."""
+    if not hosts:
+        raise ValueError("No hosts configured. Please add HOSTS list to your config.py")
+    for i, host_config in enumerate(hosts):
+        missing = [key for key in REQUIRED_HOST_KEYS if key not in host_config]
+        if not host_config.get('password') and not host_config.get('key_filename'):
+            missing.append('password or key_filename')
+        if not host_config.get('command') and not host_config.get('commands'):
+            missing.append('command')
+        if missing:
+            raise ValueError(f"HOSTS entry {i+1} is missing: {', '.join(missing)}")
+        commands = host_config.get('commands')
+        if commands is not None and (not isinstance(commands, (list, tuple)) or not commands
+                                     or not all(isinstance(command, str) and command for command in commands)):
+            raise ValueError(f"HOSTS entry {i+1}: 'commands' must be a non-empty list of command strings")
+        if 'command' in host_config and not isinstance(host_config['command'], str):
+            raise ValueError(f"HOSTS entry {i+1}: 'command' must be a string")
+
+
+def validate_log_level(level) -> str:
+    """Return LOG_LEVEL as an upper-case logging level name, raising ValueError if it isn't one."""
+    name = str(level).upper()
+    if not isinstance(getattr(logging, name, None), int):
+        raise ValueError(f"Unknown LOG_LEVEL: {level!r} (use DEBUG, INFO, WARNING or ERROR)")
+    return name
+
+
+def compile_command(command: str, accept_env: bool = False) -> Tuple[dict, str]:
+    """Split leading NAME=value assignments off a command into an environment dict.
+
+    The split is only done when the host's sshd accepts environment variables
+    (AcceptEnv) and the command needs no shell syntax; otherwise the original
+    command string is returned unchanged with an empty environment.
+    """
+    if not accept_env or _SHELL_SYNTAX_RE.search(command):
+        return {}, command
+    argv = shlex.split(command)
+    env = {}
+    while argv and _ENV_ASSIGNMENT_RE.match(argv[0]):
+        name, _, value = argv.pop(0).partition('=')
+        env[name] = value
+    if not env or not argv:
+        return {}, command
+    return env, shlex.join(argv)
+
+
+def normalize_host(index: int, host_config: dict) -> dict:
+    """Fill in defaults for one HOSTS entry ('commands' is split into command + aux_commands)."""
+    commands = host_config.get('commands') or [host_config['command']]
+    env, command = compile_command(commands[0], host_config.get('accept_env', False))
+    return {
+        'host': host_config['host'],
+        'username': host_config['username'],
+        'password': host_config.get('password'),
+        'key_filename': host_config.get('key_filename'),
+        'key_passphrase': host_config.get('key_passphrase'),
+        'command': command,
+        'env': env,
+        'aux_commands': tuple(commands[1:]),
+        'tag': host_config.get('tag', f"Host-{index+1}"),
+        'port': host_config.get('port', 22),
+    }
+
+
+def check_duplicates(records: List[dict]) -> None:
+    """Raise ValueError if two hosts share a tag.
+
+    Entries may share a connection (host, username, port), for example to plot
+    two radars on one box; they then share a pooled SSH connection.
+    """
+    seen_tags = {}
+    for i, record in enumerate(records):
+        if record['tag'] in seen_tags:
+            raise ValueError(f"HOSTS entries {seen_tags[record['tag']]+1} and {i+1} share tag '{record['tag']}'")
+        seen_tags[record['tag']] = i
+
+
+def build_hosts_soa(hosts) -> MappingProxyType:
+    """Convert the HOSTS list of dicts into one read-only tuple per field, indexed by host number."""
+    records = [normalize_host(i, host_config) for i, host_config in enumerate(hosts)]
+    check_duplicates(records)
+    for record in records:
+        for field in INTERNED_HOST_FIELDS:
+            if isinstance(record[field], str):
+                record[field] = sys.intern(record[field])
+    return MappingProxyType({field: tuple(record[field] for record in records) for field in HOST_FIELDS})
+
+
+def load_config(path: str = 'config.py') -> dict:
+    """Load, validate and cache the settings from a config file."""
+    path = os.path.abspath(path)
+    key = (path, os.stat(path).st_mtime_ns)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    module = _import_config(path)
+    config = {name: getattr(module, name) for name in CONFIG_SETTINGS if hasattr(module, name)}
+    validate_hosts(config.get('HOSTS'))
+    config['HOSTS_SOA'] = build_hosts_soa(config['HOSTS'])
+    config['GRAPH_CONFIG'] = from_dict(GraphConfig, config.get('GRAPH_CONFIG'), 'GRAPH_CONFIG')
+    config['SSH_POOL_CONFIG'] = from_dict(SSHPoolConfig, config.get('SSH_POOL_CONFIG'), 'SSH_POOL_CONFIG')
+    config['CONNECT_STAGGER'] = from_dict(ConnectStagger, config.get('CONNECT_STAGGER'), 'CONNECT_STAGGER')
+    # Optional scalar settings, resolved here so callers can index them directly
+    config['LOG_LEVEL'] = validate_log_level(config['LOG_LEVEL']) if 'LOG_LEVEL' in config else None
+    config['ENABLE_FILE_LOGGING'] = bool(config.get('ENABLE_FILE_LOGGING', False))
+
+    # Drop entries for older versions of the same file
+    for stale in [k for k in _cache if k[0] == path]:
+        del _cache[stale]
+    _cache[key] = config
+    return config
+
@@ -6,47 +6,117 @@ and displays the results in a real-time graph.
 """
 
 import asyncio
-import asyncssh
-import matplotlib
-matplotlib.use('TkAgg')  # Use TkAgg backend for GUI display
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-import matplotlib.dates as mdates
-from matplotlib.ticker import FuncFormatter
+import os
+import numpy as np
 from collections import deque
+import math
 import time
+import random
 import threading
-import queue
 import argparse
 import sys
-import os
 from typing import Dict, List, Tuple, Optional
 import logging
 from datetime import datetime, timedelta
 
+try:
+    import uvloop  # Optional faster event loop for the SSH collectors
+except ImportError:
+    uvloop = None
+
+import config_loader
+from sample_buffer import SampleRingBuffer, decimate
+from schema import ConnectStagger, GraphConfig, SSHPoolConfig
+from sample_parser import KNOWN_INIT_RE, STDOUT_CHUNK_SIZE, split_lines, split_samples
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Timestamps are time.monotonic() values (immune to clock adjustments); this offset
+# converts them to wall-clock time for the CSV log
+WALL_CLOCK_OFFSET = time.time() - time.monotonic()
+
+# Collector queue bounds: if the GUI stalls the oldest entries are dropped instead of piling up
+DATA_QUEUE_LIMIT = 10000  # Stdout chunks of plotted points
+LOG_QUEUE_LIMIT = 200     # Log lines
+
+# CSV data logs are written through a large buffer and flushed at most this often (seconds)
+LOG_FILE_BUFFER_SIZE = 65536
+LOG_FLUSH_INTERVAL = 1.0
+
+# Makes a raw line safe for the CSV's last column (commas and line breaks replaced)
+CSV_RAW_LINE_TABLE = bytes.maketrans(b',\n\r', b';  ')
+
+def select_backend(matplotlib):
+    """Use QtAgg (faster blitting) when a Qt binding imports, otherwise fall back to TkAgg."""
+    try:
+        matplotlib.use('QtAgg')
+        import matplotlib.backends.backend_qtagg  # Fails if no Qt binding is usable
+    except ImportError as e:
+        logger.debug(f"QtAgg backend unavailable, using TkAgg: {e}")
+        matplotlib.use('TkAgg')
+
+def import_pyplot():
+    """Select the GUI backend and import pyplot.
+
+    Deferred until the graph is built, so config and argument errors (and test
+    mode, which has no GUI) don't wait for matplotlib and a GUI toolkit to load.
+    """
+    import matplotlib
+    # An explicit MPLBACKEND (e.g. for headless runs) takes precedence
+    if not os.environ.get('MPLBACKEND'):
+        select_backend(matplotlib)
+    import matplotlib.pyplot as plt
+    return plt
+
+def drain_queue(q: deque) -> list:
+    """Take every item currently in a collector queue, oldest first.
+
+    The queues are plain deques: the SSH thread only appends and the GUI thread
+    only pops from the left, and both operations are atomic, so no lock is needed.
+    A bounded deque drops from the left only while it is full, so items are never
+    fewer than the length read here.
+    """
+    return [q.popleft() for _ in range(len(q))]
+
 class RadarDataCollector:
     """Handles SSH connection and data collection from a single host."""
     
-    def __init__(self, host: str, username: str, password: str, command: str, host_id: str, tag: str = None, enable_file_logging: bool = False):
+    # Fixed attribute set: no per-collector __dict__, and faster attribute access on the per-line path
+    __slots__ = ('host', 'username', 'password', 'command', 'aux_commands', 'env', 'port', 'host_config',
+                 'host_id', 'tag', 'data_queue', 'log_queue', 'status_queue', 'capture_logs',
+                 'running', 'start_time', 'chip_id', 'chip_model', 'enable_file_logging', 'log_file',
+                 'log_filename', 'log_flushed_at', 'log_second', 'log_second_str')
+    
+    def __init__(self, host: str, username: str, password: str, command: str, host_id: str, tag: str = None, enable_file_logging: bool = False, port: int = 22, aux_commands: List[str] = None, env: Dict[str, str] = None,
+                 key_filename: str = None, key_passphrase: str = None, capture_logs: bool = True):
         self.host = host
         self.username = username
         self.password = password
         self.command = command
+        self.aux_commands = list(aux_commands or [])  # Extra commands run as sessions on the same connection
+        self.env = env or None  # Environment sent with the radar command (hosts with AcceptEnv only)
+        self.port = port
+        # Connection settings handed to the shared SSH connection pool
+        self.host_config = {'host': host, 'username': username, 'password': password, 'port': port,
+                            'key_filename': key_filename, 'key_passphrase': key_passphrase}
         self.host_id = host_id
         self.tag = tag or host_id  # Use tag if provided, otherwise fall back to host_id
-        self.data_queue = queue.Queue()
-        self.log_queue = queue.Queue()
-        self.status_queue = queue.Queue()  # For tracking presence/distance status
+        # Handed from the SSH thread to the GUI thread (see drain_queue)
+        self.data_queue = deque(maxlen=DATA_QUEUE_LIMIT)  # Lists of (timestamp, distance), one per stdout chunk
+        self.log_queue = deque(maxlen=LOG_QUEUE_LIMIT)  # (timestamp, stream, line) from stderr and auxiliary commands
+        self.status_queue = deque(maxlen=1)  # Latest (timestamp, presence, distance); only the newest is shown
+        self.capture_logs = capture_logs  # Only fill log_queue when a log panel drains it
         self.running = False
         self.chip_id = None  # Store detected chip ID
         self.chip_model = None  # Store detected chip model
         self.enable_file_logging = enable_file_logging
         self.log_file = None  # File handle for logging
         self.log_filename = None  # Store the log filename
+        self.log_flushed_at = 0.0  # Monotonic time of the last log file flush
+        self.log_second = None  # Wall-clock second last formatted for the log, and its text
+        self.log_second_str = ''
         
     def create_log_file(self):
         """Create a log file for this host based on IP address and chip ID."""
@@ -74,7 +144,7 @@ class RadarDataCollector:
             os.makedirs("logs", exist_ok=True)
             
             # Open log file for writing
-            self.log_file = open(f"logs/{self.log_filename}", 'w')
+            self.log_file = open(f"logs/{self.log_filename}", 'w', buffering=LOG_FILE_BUFFER_SIZE)
             # Write CSV header with both processed and raw values
             self.log_file.write("timestamp,relative_time,processed_presence,processed_distance,raw_presence,raw_distance,raw_line\n")
             self.log_file.flush()
@@ -83,17 +153,22 @@ class RadarDataCollector:
             logger.error(f"{self.host_id}: Failed to create log file: {e}")
             self.log_file = None
     
-    def write_to_log(self, timestamp: float, presence: int, distance: float, raw_line: str, raw_presence: int = None, raw_distance: float = None):
+    def write_to_log(self, timestamp: float, presence: int, distance: float, raw_line: bytes, raw_presence: int = None, raw_distance: float = None):
         """Write data to log file if logging is enabled."""
         if self.log_file and self.enable_file_logging:
             try:
-                # Convert timestamp to readable format
-                dt = datetime.fromtimestamp(timestamp)
-                timestamp_str = dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]  # millisecond precision
+                # Convert timestamp to readable format with millisecond precision
+                # (the date and time only change once a second, so that part is reused)
+                wall_time = timestamp + WALL_CLOCK_OFFSET
+                second = int(wall_time)
+                if second != self.log_second:
+                    self.log_second = second
+                    self.log_second_str = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+                timestamp_str = f"{self.log_second_str}.{int((wall_time - second) * 1000):03d}"
                 relative_time = timestamp - getattr(self, 'start_time', timestamp)
                 
                 # Escape any commas in raw_line for CSV
-                escaped_raw_line = raw_line.replace(',', ';').replace('\n', ' ').replace('\r', ' ')
+                escaped_raw_line = raw_line.translate(CSV_RAW_LINE_TABLE).decode('utf-8', 'replace')
                 
                 # Include raw and processed values for comparison
                 raw_pres = raw_presence if raw_presence is not None else presence
@@ -101,7 +176,10 @@ class RadarDataCollector:
                 
                 # Write CSV row with both raw and processed values
                 self.log_file.write(f"{timestamp_str},{relative_time:.3f},{presence},{distance},{raw_pres},{raw_dist},{escaped_raw_line}\n")
-                self.log_file.flush()
+                # Rows are buffered; flush about once a second so the file stays close to live
+                if timestamp - self.log_flushed_at >= LOG_FLUSH_INTERVAL:
+                    self.log_file.flush()
+                    self.log_flushed_at = timestamp
             except Exception as e:
                 logger.error(f"{self.host_id}: Error writing to log file: {e}")
         
@@ -110,122 +188,164 @@ class RadarDataCollector:
         try:
             logger.info(f"Connecting to {self.host_id} at {self.host}")
             
-            # Connect to the SSH host
-            async with asyncssh.connect(
-                self.host,
-                username=self.username,
-                password=self.password,
-                known_hosts=None,  # Accept any host key (use with caution)
-                options=asyncssh.SSHClientConnectionOptions(
-                    request_pty=True  # Request PTY at connection level
-                )
-            ) as conn:
+            # Check out a pooled SSH connection (shared with other HOSTS entries on the same
+            # host, username and port) with a session for the command and each auxiliary command
+            import ssh_pool  # asyncssh is only loaded once collection starts
+            sessions = min(1 + len(self.aux_commands), ssh_pool.session_limit())
+            async with ssh_pool.get_client(self.host_config, sessions) as conn:
                 logger.info(f"Successfully connected to {self.host_id}")
                 
                 # Run the command with proper PTY settings for sudo
                 async with conn.create_process(
                     self.command, 
+                    env=self.env,
                     request_pty=True,
-                    encoding='utf-8',
+                    encoding=None,  # Raw bytes; samples are parsed without decoding
                     term_type='xterm'
                 ) as process:
                     self.running = True
-                    self.start_time = time.time()  # Record start time for relative calculations
+                    self.start_time = time.monotonic()  # Record start time for relative calculations
                     
                     logger.info(f"Successfully started command on {self.host_id}")
                     
                     # Create tasks to read both stdout and stderr
                     async def read_stdout():
-                        async for line in process.stdout:
-                            if not self.running:
+                        # Read the stream in chunks and split complete lines locally
+                        buffer = bytearray()
+                        while self.running:
+                            chunk = await process.stdout.read(STDOUT_CHUNK_SIZE)
+                            # Every line in a chunk arrived together, so stamp them once
+                            arrival = time.monotonic()
+                            # At end of output, terminate a final line that had no newline
+                            buffer += chunk or b'\n'
+                            self.handle_stdout_chunk(*split_samples(buffer), arrival)
+                            if not chunk:
                                 break
-                                
-                            line = line.strip()
-                            if line:
-                                # Forward raw stdout line to per-host log queue
-                                try:
-                                    self.log_queue.put((time.time(), 'STDOUT', line))
-                                except Exception:
-                                    pass
-                                
-                                # Check for chip ID information
-                                if 'chip id :' in line.lower():
-                                    try:
-                                        # Extract chip ID and model from line like: "get status chipid 0  chip id : 00000303 BGT60TR13C/BGT60TR13D"
-                                        parts = line.split('chip id :')
-                                        if len(parts) > 1:
-                                            chip_info = parts[1].strip().split()
-                                            if len(chip_info) >= 2:
-                                                self.chip_id = chip_info[0]
-                                                self.chip_model = chip_info[1]
-                                                logger.info(f"{self.host_id}: Detected chip {self.chip_model} (ID: {self.chip_id})")
-                                                # Create log file now that we have chip information
-                                                self.create_log_file()
-                                    except Exception as e:
-                                        logger.debug(f"{self.host_id}: Error parsing chip ID from '{line}': {e}")
-                                
-                                try:
-                                    parts = line.split()
-                                    if len(parts) >= 2:
-                                        raw_presence = int(parts[0])
-                                        raw_distance = float(parts[1])
-                                        timestamp = time.time()
-                                        
-                                        # If presence is 0, force distance to 0 regardless of what radar reports
-                                        processed_presence = raw_presence
-                                        processed_distance = raw_distance if raw_presence == 1 else 0.0
-                                        
-                                        # Write to log file with both raw and processed values
-                                        self.write_to_log(timestamp, processed_presence, processed_distance, line, raw_presence, raw_distance)
-                                        
-                                        # Always update status for log display (with processed values)
-                                        self.status_queue.put((timestamp, processed_presence, processed_distance))
-                                        
-                                        # Only queue data points when presence is detected (for plotting)
-                                        if processed_presence == 1:
-                                            self.data_queue.put((timestamp, processed_distance))
-                                            logger.debug(f"{self.host_id}: Raw={raw_presence},{raw_distance:.3f} -> Processed={processed_presence},{processed_distance:.3f}")
-                                        else:
-                                            logger.debug(f"{self.host_id}: Raw={raw_presence},{raw_distance:.3f} -> Processed={processed_presence},{processed_distance:.3f} (no plot)")
-                                        # Don't queue anything when presence = 0 (no plotting)
-                                            
-                                except (ValueError, IndexError):
-                                    # Skip logging for known initialization/status messages
-                                    known_init_messages = [
-                                        'using alternate antenna', 'debugging on', 'spi speed',
-                                        'using sensitivity setting', 'using range min', 'using range max',
-                                        'spi max speed', 'get status chipid', 'slice size',
-                                        'assuming', 'setup presence sensing', 'get defaults',
-                                        'create done', 'chip id :'
-                                    ]
-                                    
-                                    line_lower = line.lower()
-                                    is_known_message = any(msg in line_lower for msg in known_init_messages)
-                                    
-                                    if not is_known_message:
-                                        # Only log parsing errors for lines that might actually be data
-                                        logger.debug(f"{self.host_id}: Could not parse data from line: '{line}'")
                     
                     async def read_stderr():
-                        async for line in process.stderr:
-                            if not self.running:
+                        # Same chunked reading as stdout; stderr lines are only logged
+                        buffer = bytearray()
+                        while self.running:
+                            chunk = await process.stderr.read(STDOUT_CHUNK_SIZE)
+                            buffer += chunk or b'\n'
+                            for raw_line in split_lines(buffer):
+                                self.handle_stderr_line(raw_line)
+                            if not chunk:
                                 break
-                            line = line.strip()
-                            if line:
-                                logger.error(f"{self.host_id} STDERR: {line}")
-                                # Forward raw stderr line to per-host log queue
-                                try:
-                                    self.log_queue.put((time.time(), 'STDERR', line))
-                                except Exception:
-                                    pass
                     
-                    # Run both readers concurrently
-                    await asyncio.gather(read_stdout(), read_stderr(), return_exceptions=True)
+                    # Run both readers (and any auxiliary command sessions) concurrently
+                    readers = [read_stdout(), read_stderr()]
+                    if self.aux_commands:
+                        readers.append(self.run_aux_commands(conn, self.aux_commands, sessions - 1))
+                    await asyncio.gather(*readers, return_exceptions=True)
                                 
         except Exception as e:
             logger.error(f"Error connecting to {self.host_id} ({self.host}): {e}")
             self.running = False
     
+    def handle_stderr_line(self, raw_line: bytes):
+        """Log one line of the command's stderr and forward it to the log queue."""
+        line = raw_line.decode('utf-8', 'replace').strip()
+        if line:
+            logger.error(f"{self.host_id} STDERR: {line}")
+            # Forward raw stderr line to per-host log queue
+            if self.capture_logs:
+                self.log_queue.append((time.monotonic(), 'STDERR', line))
+    
+    def handle_stdout_chunk(self, lines: List[bytes], samples: List[Optional[Tuple[int, float]]], arrival: float):
+        """Process the complete lines read from one stdout chunk (received at arrival) and queue their results."""
+        points = []
+        status = None
+        for raw_line, sample in zip(lines, samples):
+            processed = self.handle_stdout_line(raw_line.strip(), sample, arrival)
+            if processed is not None:
+                status = processed
+                if processed[1] == 1:
+                    points.append((processed[0], processed[2]))
+        
+        # One queue entry per chunk: the plotted points as a batch, and only the latest status
+        if points:
+            self.data_queue.append(points)
+        if status is not None:
+            self.status_queue.append(status)
+    
+    def handle_stdout_line(self, raw_line: bytes, sample: Optional[Tuple[int, float]], timestamp: float) -> Optional[Tuple[float, int, float]]:
+        """Process one stripped line of radar command output and its parsed sample (or None).
+
+        Returns the processed (timestamp, presence, distance) for sample lines.
+        """
+        if not raw_line:
+            return None
+        
+        # Check for chip ID information (sample lines never carry it, so they skip the scan)
+        if sample is None and b'chip id :' in raw_line.lower():
+            line = raw_line.decode('utf-8', 'replace')
+            try:
+                # Extract chip ID and model from line like: "get status chipid 0  chip id : 00000303 BGT60TR13C/BGT60TR13D"
+                parts = line.split('chip id :')
+                if len(parts) > 1:
+                    chip_info = parts[1].strip().split()
+                    if len(chip_info) >= 2:
+                        self.chip_id = chip_info[0]
+                        self.chip_model = chip_info[1]
+                        logger.info(f"{self.host_id}: Detected chip {self.chip_model} (ID: {self.chip_id})")
+                        # Create log file now that we have chip information
+                        self.create_log_file()
+            except Exception as e:
+                logger.debug(f"{self.host_id}: Error parsing chip ID from '{line}': {e}")
+        
+        if sample is not None:
+            raw_presence, raw_distance = sample
+            
+            # If presence is 0, force distance to 0 regardless of what radar reports
+            processed_presence = raw_presence
+            processed_distance = raw_distance if raw_presence == 1 else 0.0
+            
+            # Write to log file with both raw and processed values
+            self.write_to_log(timestamp, processed_presence, processed_distance, raw_line, raw_presence, raw_distance)
+            
+            # Only data points with presence detected are plotted (message built only when debug logging is on)
+            if logger.isEnabledFor(logging.DEBUG):
+                suffix = "" if processed_presence == 1 else " (no plot)"
+                logger.debug(f"{self.host_id}: Raw={raw_presence},{raw_distance:.3f} -> Processed={processed_presence},{processed_distance:.3f}{suffix}")
+            return timestamp, processed_presence, processed_distance
+        else:
+            # Skip logging for known initialization/status messages (only checked when debug logging is on)
+            if logger.isEnabledFor(logging.DEBUG) and not KNOWN_INIT_RE.search(raw_line):
+                # Only log parsing errors for lines that might actually be data
+                logger.debug(f"{self.host_id}: Could not parse data from line: '{raw_line.decode('utf-8', 'replace')}'")
+            return None
+    
+    async def run_aux_commands(self, conn, commands: List[str], free_sessions: int):
+        """Run auxiliary commands as extra sessions on conn, spilling onto another pooled connection when full."""
+        here, rest = commands[:free_sessions], commands[free_sessions:]
+        sessions = [self.run_aux_command(conn, command) for command in here]
+        if rest:
+            sessions.append(self.run_aux_overflow(rest))
+        await asyncio.gather(*sessions, return_exceptions=True)
+    
+    async def run_aux_overflow(self, commands: List[str]):
+        """Run commands that did not fit on the primary connection on a second pooled connection."""
+        import ssh_pool
+        sessions = min(len(commands), ssh_pool.session_limit())
+        async with ssh_pool.get_client(self.host_config, sessions) as conn:
+            await self.run_aux_commands(conn, commands, sessions)
+    
+    async def run_aux_command(self, conn, command: str):
+        """Run an auxiliary command (health, version, ...) and forward its output to the log queue."""
+        try:
+            async with conn.create_process(command, encoding='utf-8') as process:
+                async for line in process.stdout:
+                    if not self.running:
+                        break
+                    line = line.strip()
+                    if line:
+                        logger.info(f"{self.host_id} [{command}]: {line}")
+                        if self.capture_logs:
+                            self.log_queue.append((time.monotonic(), 'AUX', line))
+        except Exception as e:
+            logger.error(f"{self.host_id}: Auxiliary command '{command}' failed: {e}")
+    
     def stop(self):
         """Stop data collection."""
         self.running = False
@@ -241,9 +361,12 @@ class RadarDataCollector:
 class RealTimeGrapher:
     """Handles real-time graphing of distance data from multiple hosts."""
     
-    def __init__(self, collectors: List[RadarDataCollector], max_points: int = 100):
+    def __init__(self, collectors: List[RadarDataCollector], max_points: int = 100,
+                 update_interval: int = 100, render_interval: int = 200):
         self.collectors = collectors
         self.max_points = max_points
+        self.update_interval = update_interval  # Queue ingest period (ms)
+        self.render_interval = render_interval  # Redraw period (ms)
         
         # Time window options (in seconds)
         self.time_windows = {
@@ -260,19 +383,19 @@ class RealTimeGrapher:
         self.zoom_start = 0  # Start time for zoomed view
         self.zoom_duration = self.time_window  # Duration of zoomed view in seconds
         
-        # Data storage for each host
-        self.data = {}
+        # Data storage for each host, indexed like self.collectors
+        self.data = []
         for collector in collectors:
-            self.data[collector.host_id] = {
-                'times': deque(),  # No maxlen - we'll manage time-based cleanup
-                'distances': deque(),
+            self.data.append({
+                'samples': SampleRingBuffer(max_points),  # Grows as needed; cleanup is time-based
                 'line': None,
                 'connected': False,
                 'last_data_time': None,
                 'connection_timeout': 10.0  # Consider disconnected after 10 seconds without data
-            }
+            })
         
         # Set up the plot with an additional text area for recent logs
+        plt = import_pyplot()
         self.fig = plt.figure(figsize=(12, 8))
         # Main chart axes (balanced chart area with proper space for x-axis labels)
         self.ax = self.fig.add_axes([0.08, 0.45, 0.88, 0.50])
@@ -280,10 +403,14 @@ class RealTimeGrapher:
         self.log_ax = self.fig.add_axes([0.08, 0.02, 0.88, 0.30])
         self.log_ax.axis('off')
         # Increase font size for distance viewing (half previous), and nudge one line down
-        self.log_text = self.log_ax.text(0.01, 0.90, "", va='top', ha='left', family='monospace', fontsize=22)
+        # Animated, so full redraws leave it out of the background; it is blitted on its own when it changes
+        self.log_text = self.log_ax.text(0.01, 0.90, "", va='top', ha='left', family='monospace', fontsize=22,
+                                         animated=True)
+        self.log_background = None  # Log panel background saved after each full redraw
         self.max_log_lines = 8  # retained but unused for now; kept for future toggles
-        # Per-host latest log line (timestamp, tag, stream, line)
-        self.latest_logs = {collector.host_id: None for collector in collectors}
+        # Per-host time of the latest sample or log line relative to start_time (None until one
+        # arrives); the panel shows no line content, so only the timestamp is kept
+        self.latest_log_times = [None] * len(collectors)
         
         # Add time window selection buttons (positioned with comfortable gap)
         self.time_window_buttons = []
@@ -294,6 +421,7 @@ class RealTimeGrapher:
         button_y = 0.35  # Positioned with comfortable separation from chart and log panel
         
         from matplotlib.widgets import Button
+        from matplotlib.ticker import FuncFormatter
         
         for i, label in enumerate(self.time_window_labels):
             button_x = start_x + i * (button_width + button_spacing)
@@ -332,60 +460,91 @@ class RealTimeGrapher:
         colors = ['blue', 'red', 'green', 'orange', 'purple']
         for i, collector in enumerate(collectors):
             color = colors[i % len(colors)]
-            line, = self.ax.plot([], [], color=color, label=f'{collector.tag} (⚡ Connecting...)', linewidth=2)
-            self.data[collector.host_id]['line'] = line
+            line, = self.ax.plot([], [], color=color, label=f'{collector.tag} (⚡ Connecting...)', linewidth=2, animated=True)
+            self.data[i]['line'] = line
+        self.lines = [host_data['line'] for host_data in self.data]
+        
+        # The host set is fixed for the run, so bind each host's queue and buffer
+        # methods once instead of looking them up on every frame
+        self.ingest_handles = tuple(
+            (host_data, collector.status_queue, collector.data_queue, host_data['samples'].extend)
+            for collector, host_data in zip(collectors, self.data)
+        )
+        self.render_handles = tuple(
+            (host_data['samples'].evict_before, host_data['samples'],
+             host_data['samples'].extrema, host_data['line'].set_data)
+            for host_data in self.data
+        )
+        self.legend_needs_update = False
+        self.plot_dirty = True  # Set when samples are added or cleared; lines and y limits are recomputed
+        self.log_panel_dirty = True  # Set when a host's status or latest log line changes
+        self.animation = None
+        self.frame_requested = False
         
         self.legend = self.ax.legend(loc='upper right')
+        # Kept out of the cached blit background, so relabelling leaves no stale text behind its frame
+        self.legend.set_animated(True)
+        self.legend_texts = self.legend.get_texts()  # Updated in place by update_legend
+        # Artists returned to the blitter on every frame (the log panel is blitted separately)
+        self.artists = self.lines + [self.legend]
         
         # Animation setup
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        # Blitting only redraws animated artists; limits/title changes need a full redraw
+        self.xlim = None
+        self.ylim = None
+        self.redraw_pending = True
         
         # Connect keyboard events for scrollback control
         self.fig.canvas.mpl_connect('key_press_event', self.on_key_press)
+        self.fig.canvas.mpl_connect('draw_event', self.on_draw)
         
-    def update_plot(self, frame):
-        """Update the plot with new data."""
-        current_time = time.time()
-        current_relative_time = current_time - self.start_time
-        
-        # Track if we need to update legend
-        legend_needs_update = False
+    def ingest(self):
+        """Ingest queued data (runs every update_interval) and request a frame if needed."""
+        samples_added = self.drain_collectors()
         
+        # Draw a frame when something visible changed, or when the time axis moves on (once a second)
+        if (samples_added or self.legend_needs_update or self.log_panel_dirty or self.redraw_pending
+                or self.xlim is None or math.ceil(time.monotonic() - self.start_time) != self.xlim[1]):
+            self.request_frame()
+    
+    def drain_collectors(self) -> bool:
+        """Move queued samples into the ring buffers; returns True if any samples were added."""
+        current_time = time.monotonic()
+        start_time = self.start_time
+        samples_added = False
         # Collect new data from all hosts
-        for collector in self.collectors:
-            host_data = self.data[collector.host_id]
-            was_connected = host_data['connected']
+        for i, (host_data, status_queue, data_queue, extend_samples) in enumerate(self.ingest_handles):
             data_received = False  # Initialize for each collector
             
-            # Process status updates for log display
-            while not collector.status_queue.empty():
-                try:
-                    timestamp, presence, distance = collector.status_queue.get_nowait()
-                    data_received = True
-                    host_data['last_data_time'] = current_time
-                    # Track last presence/distance for log display
-                    host_data['last_presence'] = presence
-                    host_data['last_distance'] = distance
-                except queue.Empty:
-                    break
+            # Process status updates for log display (only the latest one is shown)
+            statuses = drain_queue(status_queue)
+            if statuses:
+                timestamp, presence, distance = statuses[-1]
+                data_received = True
+                host_data['last_data_time'] = current_time
+                # Track last presence/distance for log display
+                host_data['last_presence'] = presence
+                host_data['last_distance'] = distance
+                # Raw stdout lines aren't queued, so samples stamp the panel row
+                self.latest_log_times[i] = timestamp - start_time
+                self.log_panel_dirty = True
             
-            # Process plotting data points (only when presence=1)
-            while not collector.data_queue.empty():
-                try:
-                    timestamp, distance = collector.data_queue.get_nowait()
-                    relative_time = timestamp - self.start_time
-                    data_received = True  # Mark that we received data
-                    # Add to plot data
-                    host_data['times'].append(relative_time)
-                    host_data['distances'].append(distance)
-                except queue.Empty:
-                    break
+            # Process plotting data points (only when presence=1), queued in per-chunk batches
+            batches = drain_queue(data_queue)
+            if batches:
+                data_received = True  # Mark that we received data
+                samples_added = True
+                self.plot_dirty = True
+                # Convert every queued point at once and copy them into the plot data in bulk
+                points = np.array([point for batch in batches for point in batch], dtype=np.float64)
+                extend_samples(points[:, 0] - start_time, points[:, 1])
             
             # Update connection status based on recent data and timeouts
             if data_received:
                 if not host_data['connected']:
                     host_data['connected'] = True
-                    legend_needs_update = True
+                    self.legend_needs_update = True
             else:
                 # Check for timeout - if no data received recently, mark as disconnected
                 if host_data['last_data_time'] is not None:
@@ -393,75 +552,133 @@ class RealTimeGrapher:
                     if time_since_last_data > host_data['connection_timeout']:
                         if host_data['connected']:
                             host_data['connected'] = False
-                            legend_needs_update = True
-            
-            # Remove old data points (older than time_window) only if not in scrollback mode
-            if not self.scrollback_mode:
-                cutoff_time = current_relative_time - self.time_window
-                while host_data['times'] and host_data['times'][0] < cutoff_time:
-                    host_data['times'].popleft()
-                    host_data['distances'].popleft()
-            
-            # Update the line plot
-            if host_data['times'] and host_data['distances']:
-                host_data['line'].set_data(list(host_data['times']), list(host_data['distances']))
+                            self.legend_needs_update = True
+        return samples_added
+    
+    def request_frame(self):
+        """Start the animation timer so one frame is drawn after render_interval."""
+        if self.animation is not None and not self.frame_requested:
+            self.frame_requested = True
+            self.animation.event_source.start()
+    
+    def update_plot(self, frame):
+        """Redraw the plot from the buffered data (at most every render_interval)."""
+        # Frames are drawn on request (see ingest), so stop the timer until the next one
+        if self.animation is not None:
+            self.frame_requested = False
+            self.animation.event_source.stop()
+        self.drain_collectors()
+        current_relative_time = time.monotonic() - self.start_time
+        # The scrollback y range depends on the scrolled window, so it is always recomputed
+        plot_dirty = self.plot_dirty or self.scrollback_mode
+        self.plot_dirty = False
+        
+        # Remove old data points (older than time_window) only if not in scrollback mode
+        if not self.scrollback_mode:
+            cutoff_time = current_relative_time - self.time_window
+            for evict_before, _, _, _ in self.render_handles:
+                if evict_before(cutoff_time):
+                    plot_dirty = True
         
         # Set up time window
         if self.scrollback_mode:
             # In scrollback mode, show a window starting from zoom_start
             time_start = self.zoom_start
             time_end = self.zoom_start + self.zoom_duration
-            # Ensure we don't go beyond available data
-            max_time = current_relative_time
+            # Ensure we don't go beyond available data (whole seconds, so the view only moves once a second)
+            max_time = math.ceil(current_relative_time)
             if time_end > max_time:
                 time_end = max_time
                 time_start = max(0, time_end - self.zoom_duration)
         else:
-            # Normal mode: show last 2 minutes
-            time_start = current_relative_time - self.time_window
-            time_end = current_relative_time
+            # Normal mode: show the selected time window, advanced in whole seconds
+            time_end = math.ceil(current_relative_time)
+            time_start = time_end - self.time_window
         
-        self.ax.set_xlim(time_start, time_end)
+        self.set_view_limits(xlim=(time_start, time_end))
         
-        # Auto-scale Y-axis based on current data in view
-        all_distances = []
-        for host_data in self.data.values():
-            if host_data['distances'] and host_data['times']:
-                # In scrollback mode, only consider distances within the current time window
+        # Update the line plots and collect each host's (min, max) distance in view
+        host_extrema = []
+        if plot_dirty:
+            # More than two points per horizontal pixel can't be seen, so longer lines are decimated
+            max_line_points = max(2, int(self.ax.bbox.width * 2))
+            for _, samples, extrema, set_line_data in self.render_handles:
+                times, distances = samples.view()
                 if self.scrollback_mode:
-                    visible_distances = []
-                    for t, d in zip(host_data['times'], host_data['distances']):
-                        if time_start <= t <= time_end:
-                            visible_distances.append(d)
-                    all_distances.extend(visible_distances)
+                    # Times are sorted, so the scrolled window is found by binary search and sliced
+                    first = int(times.searchsorted(time_start, side='left'))
+                    last = int(times.searchsorted(time_end, side='right'))
+                    visible = distances[first:last]
+                    host_extrema.append((float(visible.min()), float(visible.max())) if visible.size else None)
+                    # Plot only the window, plus one sample either side so the line reaches its edges
+                    first = max(first - 1, 0)
+                    set_line_data(*decimate(times[first:last + 1], distances[first:last + 1],
+                                            samples.first_index + first, max_line_points))
                 else:
-                    all_distances.extend(host_data['distances'])
+                    # The buffer holds exactly the visible window, so its cached extremes apply
+                    host_extrema.append(extrema())
+                    if times.size:
+                        set_line_data(*decimate(times, distances, samples.first_index, max_line_points))
         
-        if all_distances:
-            min_dist = min(all_distances)
-            max_dist = max(all_distances)
-            dist_range = max_dist - min_dist
+        # Auto-scale Y-axis based on current data in view (unchanged data keeps the current limits)
+        dist_min = dist_max = None
+        for extremes in host_extrema:
+            if extremes is not None:
+                host_min, host_max = extremes
+                dist_min = host_min if dist_min is None else min(dist_min, host_min)
+                dist_max = host_max if dist_max is None else max(dist_max, host_max)
+        
+        if dist_min is not None:
+            dist_range = dist_max - dist_min
             dist_margin = max(0.05, dist_range * 0.1)  # At least 5cm margin
+            ylim = (dist_min - dist_margin, dist_max + dist_margin)
             
-            self.ax.set_ylim(min_dist - dist_margin, max_dist + dist_margin)
-        else:
+            # Keep the current limits while the data still fits and fills at least half of
+            # them, so small changes in the extremes don't force a full redraw every frame
+            if self.ylim is not None:
+                current_min, current_max = self.ylim
+                if (current_min <= dist_min and dist_max <= current_max
+                        and ylim[1] - ylim[0] >= 0.5 * (current_max - current_min)):
+                    ylim = self.ylim
+            self.set_view_limits(ylim=ylim)
+        elif plot_dirty:
             # Default range if no data
-            self.ax.set_ylim(0, 2)
+            self.set_view_limits(ylim=(0, 2))
         
         # Update legend if connection status changed
-        if legend_needs_update:
+        if self.legend_needs_update:
+            self.legend_needs_update = False
             self.update_legend()
         
         # Update the log panel with the most recent line from each host
         self.update_log_panel()
         
-        return [host_data['line'] for host_data in self.data.values()]
+        # Refresh the static background (axes, ticks, grid, title) before the animated artists are blitted
+        if self.redraw_pending:
+            self.redraw_pending = False
+            self.fig.canvas.draw()
+        
+        return self.animated_artists()
+    
+    def animated_artists(self):
+        """Return the artists redrawn on every frame when blitting."""
+        return self.artists
+    
+    def set_view_limits(self, xlim=None, ylim=None):
+        """Apply axis limits, scheduling a full redraw only when they actually change."""
+        if xlim is not None and xlim != self.xlim:
+            self.xlim = xlim
+            self.ax.set_xlim(*xlim)
+            self.redraw_pending = True
+        if ylim is not None and ylim != self.ylim:
+            self.ylim = ylim
+            self.ax.set_ylim(*ylim)
+            self.redraw_pending = True
     
     def update_legend(self):
         """Update the legend with current connection status and chip information."""
         labels = []
-        for collector in self.collectors:
-            host_data = self.data[collector.host_id]
+        for collector, host_data in zip(self.collectors, self.data):
             if host_data['connected']:
                 status = "✓ Connected"
             elif host_data['last_data_time'] is not None:
@@ -478,47 +695,76 @@ class RealTimeGrapher:
             
             labels.append(f"{collector.tag}{chip_info} ({status})")
         
-        # Update legend with fixed position
-        self.legend.remove()
-        self.legend = self.ax.legend([host_data['line'] for host_data in self.data.values()], labels, loc='upper right')
+        # Relabel the existing legend entries (the legend box is resized when drawn)
+        for text, label in zip(self.legend_texts, labels):
+            text.set_text(label)
     
     def start(self):
         """Start the real-time plotting."""
+        import matplotlib.animation as animation
+        import matplotlib.pyplot as plt
+        # Samples are ingested at update_interval; frames are drawn at most every render_interval,
+        # and only when ingest finds something to show
+        self.ingest_timer = self.fig.canvas.new_timer(interval=self.update_interval)
+        self.ingest_timer.add_callback(self.ingest)
+        self.ingest_timer.start()
         ani = animation.FuncAnimation(
-            self.fig, self.update_plot, interval=100, blit=False, cache_frame_data=False
+            self.fig, self.update_plot, init_func=self.animated_artists,
+            interval=self.render_interval, blit=True, cache_frame_data=False
         )
+        self.animation = ani
         plt.show()
         return ani
 
-    def update_log_panel(self):
-        """Collect latest raw log line per host and render them in the log panel as fixed rows."""
+    def update_log_panel(self) -> bool:
+        """Collect latest raw log line per host and render them in the log panel as fixed rows.
+
+        Returns True if the panel text changed.
+        """
         # Drain new log lines from collectors and retain only the most recent per host
-        for collector in self.collectors:
-            while not collector.log_queue.empty():
-                try:
-                    ts, stream, line = collector.log_queue.get_nowait()
-                    self.latest_logs[collector.host_id] = (ts - self.start_time, collector.tag, stream, line)
-                except queue.Empty:
-                    break
+        for i, collector in enumerate(self.collectors):
+            logs = drain_queue(collector.log_queue)
+            if logs:
+                rel_ts = logs[-1][0] - self.start_time
+                # Keep the newer of this and the latest sample's time (set in drain_collectors)
+                if self.latest_log_times[i] is None or rel_ts > self.latest_log_times[i]:
+                    self.latest_log_times[i] = rel_ts
+                self.log_panel_dirty = True
+        if not self.log_panel_dirty:
+            return False
+        self.log_panel_dirty = False
         # Render one line per host, in collector order, aligned columns
         rendered = []
-        for collector in self.collectors:
-            latest = self.latest_logs.get(collector.host_id)
+        for collector, host_data, rel_ts in zip(self.collectors, self.data, self.latest_log_times):
             # Pull last parsed presence/distance if available
-            host_data = self.data.get(collector.host_id, {})
             last_presence = host_data.get('last_presence')
             last_distance = host_data.get('last_distance')
             pres_str = '-' if last_presence is None else f"{last_presence:d}"
             dist_str = '---' if last_distance is None else f"{last_distance:0.3f}m"
-            if latest is None:
+            if rel_ts is None:
                 rel_ts = 0.0
-            else:
-                rel_ts, tag, stream, raw = latest
             # Render without stream/raw content
             rendered.append(
                 f"[{rel_ts:6.1f}s]  {collector.tag:<14}  pres:{pres_str:>1}  dist:{dist_str:>9}"
             )
-        self.log_text.set_text("\n".join(rendered))
+        text = "\n".join(rendered)
+        if text == self.log_text.get_text():
+            return False
+        self.log_text.set_text(text)
+        if self.log_background is not None:
+            self.fig.canvas.restore_region(self.log_background)
+            self.blit_log_panel()
+        return True
+    
+    def on_draw(self, event):
+        """Save the log panel background after a full redraw and draw the log text over it."""
+        self.log_background = self.fig.canvas.copy_from_bbox(self.log_ax.bbox)
+        self.blit_log_panel()
+    
+    def blit_log_panel(self):
+        """Draw the log text and copy the log panel to the screen."""
+        self.log_ax.draw_artist(self.log_text)
+        self.fig.canvas.blit(self.log_ax.bbox)
     
     def on_key_press(self, event):
         """Handle keyboard events for scrollback and zoom control."""
@@ -527,7 +773,7 @@ class RealTimeGrapher:
             self.scrollback_mode = not self.scrollback_mode
             current_window_label = self.time_window_labels[self.current_time_window_index]
             if self.scrollback_mode:
-                current_time = time.time() - self.start_time
+                current_time = time.monotonic() - self.start_time
                 self.zoom_start = max(0, current_time - self.zoom_duration)
                 self.ax.set_title(f'Real-time Radar Distance Monitoring - {current_window_label} view (SCROLLBACK MODE - Press S to toggle, ← → to scroll, + - to zoom)')
                 logger.info("Scrollback mode ENABLED - Use arrow keys to scroll, +/- to zoom, S to toggle")
@@ -543,7 +789,7 @@ class RealTimeGrapher:
         elif self.scrollback_mode and event.key == 'right':
             # Scroll forward
             scroll_amount = self.zoom_duration * 0.1  # 10% of current view
-            current_time = time.time() - self.start_time
+            current_time = time.monotonic() - self.start_time
             max_start = max(0, current_time - self.zoom_duration)
             self.zoom_start = min(max_start, self.zoom_start + scroll_amount)
         
@@ -565,8 +811,15 @@ class RealTimeGrapher:
         
         elif self.scrollback_mode and event.key == 'end':
             # Go to end (current time)
-            current_time = time.time() - self.start_time
+            current_time = time.monotonic() - self.start_time
             self.zoom_start = max(0, current_time - self.zoom_duration)
+        
+        else:
+            return
+        
+        # The view changed: redraw now rather than on the next ingest tick
+        self.redraw_pending = True
+        self.request_frame()
     
     def change_time_window(self, index):
         """Change the time window for the chart display."""
@@ -582,25 +835,28 @@ class RealTimeGrapher:
             self.ax.set_title(f'Real-time Radar Distance Monitoring - {current_window_label} view (Press S for scrollback mode)')
         
         self.update_button_colors()
+        self.request_frame()
         logger.info(f"Changed time window to: {current_window_label}")
     
     def clear_chart(self, event):
         """Clear all chart data and reset the display."""
         # Clear all data for each host
-        for host_id, host_data in self.data.items():
-            host_data['times'].clear()
-            host_data['distances'].clear()
+        for host_data in self.data:
+            host_data['samples'].clear()
             host_data['line'].set_data([], [])
             
         # Reset the chart limits
-        self.ax.set_ylim(0, 2)
+        self.set_view_limits(ylim=(0, 2))
+        self.plot_dirty = True
         
         # Reset scrollback mode if active
         if self.scrollback_mode:
             self.scrollback_mode = False
             current_window_label = self.time_window_labels[self.current_time_window_index]
             self.ax.set_title(f'Real-time Radar Distance Monitoring - {current_window_label} view (Press S for scrollback mode)')
+            self.redraw_pending = True
         
+        self.request_frame()
         logger.info("Chart data cleared")
     
     def update_button_colors(self):
@@ -610,17 +866,32 @@ class RealTimeGrapher:
                 button.ax.set_facecolor('lightblue')  # Active button
             else:
                 button.ax.set_facecolor('lightgray')  # Inactive buttons
-        # Refresh the display
-        if hasattr(self.fig, 'canvas') and self.fig.canvas:
-            self.fig.canvas.draw_idle()
+        # Refresh the display on the next animation frame
+        self.redraw_pending = True
 
-async def run_ssh_collectors(collectors: List[RadarDataCollector], test_duration: int = None):
+async def run_ssh_collectors(collectors: List[RadarDataCollector], test_duration: int = None, connect_stagger: ConnectStagger = None,
+                             pool_config: SSHPoolConfig = None):
     """Run all SSH collectors concurrently."""
+    # Imported here rather than at module level, so argument and config errors
+    # are reported without waiting for asyncssh to load
+    import ssh_pool
+    ssh_pool.configure(pool_config)
     logger.info(f"Starting SSH data collection for {len(collectors)} hosts...")
     for i, collector in enumerate(collectors):
         logger.info(f"Host {i+1}: {collector.tag} at {collector.host}")
     
-    tasks = [asyncio.create_task(collector.collect_data()) for collector in collectors]
+    stagger_base, stagger_jitter = connect_stagger or ConnectStagger()
+    
+    async def start_collector(index: int, collector: RadarDataCollector):
+        # Spread initial connects so large host lists don't hit sshd's MaxStartups limit
+        delay = index * stagger_base + random.uniform(0, stagger_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await collector.collect_data()
+    
+    tasks = [asyncio.create_task(start_collector(i, collector)) for i, collector in enumerate(collectors)]
+    # No heartbeat when keepalives are disabled (it would otherwise spin with a zero interval)
+    heartbeat_task = asyncio.create_task(ssh_pool.heartbeat()) if ssh_pool.keepalive_enabled() else None
     try:
         if test_duration:
             # Wait for either all tasks to complete or test duration to expire
@@ -633,27 +904,50 @@ async def run_ssh_collectors(collectors: List[RadarDataCollector], test_duration
         logger.info("Stopping data collection...")
         for collector in collectors:
             collector.stop()
+    finally:
+        if heartbeat_task is not None:
+            heartbeat_task.cancel()
+        await ssh_pool.close_all()
+
+def run_event_loop(main):
+    """Run a coroutine to completion on a new event loop, using uvloop when it is installed."""
+    if uvloop is None:
+        return asyncio.run(main)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main)
 
 def load_config():
     """Load configuration from config.py file."""
-    import os
-    import sys
-    import importlib.util
-    
     try:
-        # Try to import config.py using importlib
-        config_path = os.path.join(os.getcwd(), 'config.py')
-        if os.path.exists(config_path):
-            spec = importlib.util.spec_from_file_location("config", config_path)
-            config = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(config)
-            return config
-        else:
-            raise ImportError("config.py file not found")
-    except Exception as e:
+        return config_loader.load_config(os.path.join(os.getcwd(), 'config.py'))
+    except FileNotFoundError:
         logger.error("config.py not found. Please copy config_example.py to config.py and modify it.")
         logger.error("You can also use command-line arguments instead.")
-        return None
+    except Exception as e:
+        logger.error(f"Invalid config.py: {e}")
+    return None
+
+def positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+def check_host_args(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Check the per-host command line arguments, exiting through parser.error on the first problem."""
+    if not args.host:
+        parser.error("no hosts specified with --host")
+    num_hosts = len(args.host)
+    for option, values in (('--user', args.user), ('--password', args.password),
+                           ('--command', args.command), ('--tag', args.tag)):
+        if values and len(values) != num_hosts:
+            parser.error(f"{option} given {len(values)} time(s), but there are {num_hosts} host(s)")
+    if not args.user or not args.password or not args.command:
+        parser.error("must specify --user, --password, and --command for each host")
 
 def main():
     """Main function to set up and run the radar distance monitor."""
@@ -668,13 +962,13 @@ def main():
     parser.add_argument('--command', action='append', help='Command to run (must match number of hosts)')
     parser.add_argument('--tag', action='append', help='Display name for host on chart (optional)')
     
-    parser.add_argument('--max-points', type=int, default=100, 
+    parser.add_argument('--max-points', type=positive_int, default=100, 
                        help='Maximum number of data points to display')
     parser.add_argument('--enable-file-logging', action='store_true',
                        help='Enable logging radar data to individual CSV files per host')
     parser.add_argument('--test-mode', action='store_true',
                        help='Run in test mode (SSH connections only, no GUI)')
-    parser.add_argument('--test-duration', type=int, default=60,
+    parser.add_argument('--test-duration', type=positive_int, default=60,
                        help='Duration in seconds for test mode (default: 60 seconds)')
     
     args = parser.parse_args()
@@ -691,69 +985,51 @@ def main():
         if config is None:
             sys.exit(1)
         
-        # Set up logging level from config
-        if hasattr(config, 'LOG_LEVEL'):
-            numeric_level = getattr(logging, config.LOG_LEVEL.upper(), None)
-            if isinstance(numeric_level, int):
-                logging.getLogger().setLevel(numeric_level)
+        # Set up logging level from config (validated by the loader)
+        if config['LOG_LEVEL']:
+            logging.getLogger().setLevel(config['LOG_LEVEL'])
         
-        # Create data collectors from config
+        # Create data collectors from config (HOSTS is validated by the loader)
         collectors = []
         
-        # Check for HOSTS configuration
-        if hasattr(config, 'HOSTS') and config.HOSTS:
-            # Get file logging setting from config
-            enable_file_logging = getattr(config, 'ENABLE_FILE_LOGGING', False)
-            
-            for i, host_config in enumerate(config.HOSTS):
-                host_id = f"Host-{i+1}"
-                collectors.append(RadarDataCollector(
-                    host_config['host'],
-                    host_config['username'],
-                    host_config['password'],
-                    host_config['command'],
-                    host_id,
-                    host_config.get('tag', host_id),
-                    enable_file_logging
-                ))
-        else:
-            logger.error("No hosts configured. Please add HOSTS list to your config.py")
-            sys.exit(1)
+        # Get file logging setting from config
+        enable_file_logging = config['ENABLE_FILE_LOGGING']
+        
+        hosts = config['HOSTS_SOA']
+        for i in range(len(hosts['host'])):
+            collectors.append(RadarDataCollector(
+                hosts['host'][i],
+                hosts['username'][i],
+                hosts['password'][i],
+                hosts['command'][i],
+                f"Host-{i+1}",
+                hosts['tag'][i],
+                enable_file_logging,
+                hosts['port'][i],
+                hosts['aux_commands'][i],
+                hosts['env'][i],
+                key_filename=hosts['key_filename'][i],
+                key_passphrase=hosts['key_passphrase'][i],
+                capture_logs=not args.test_mode  # Nothing drains the log queue without the GUI
+            ))
         
         logger.info(f"Configured {len(collectors)} host(s) for monitoring")
         
-        # Get max points from config
-        max_points = getattr(config, 'GRAPH_CONFIG', {}).get('max_points', 100)
+        # SSH connection pool settings, applied when collection starts
+        pool_config = config['SSH_POOL_CONFIG']
+        connect_stagger = config['CONNECT_STAGGER']
+        
+        # Get graph settings from config
+        graph_config = config['GRAPH_CONFIG']
         
     else:
         # Use command line arguments
         logger.info("Using command line arguments")
         collectors = []
         
-        # Validate command line arguments
-        if not args.host:
-            logger.error("No hosts specified with --host argument")
-            sys.exit(1)
-        
-        # Validate that arrays have consistent lengths
+        # Validate command line arguments (exits with a usage message on error)
+        check_host_args(parser, args)
         num_hosts = len(args.host)
-        if args.user and len(args.user) != num_hosts:
-            logger.error(f"Number of usernames ({len(args.user)}) must match number of hosts ({num_hosts})")
-            sys.exit(1)
-        if args.password and len(args.password) != num_hosts:
-            logger.error(f"Number of passwords ({len(args.password)}) must match number of hosts ({num_hosts})")
-            sys.exit(1)
-        if args.command and len(args.command) != num_hosts:
-            logger.error(f"Number of commands ({len(args.command)}) must match number of hosts ({num_hosts})")
-            sys.exit(1)
-        if args.tag and len(args.tag) != num_hosts:
-            logger.error(f"Number of tags ({len(args.tag)}) must match number of hosts ({num_hosts})")
-            sys.exit(1)
-        
-        # Ensure we have required fields
-        if not args.user or not args.password or not args.command:
-            logger.error("Must specify --user, --password, and --command for each host")
-            sys.exit(1)
         
         # Create collectors
         for i in range(num_hosts):
@@ -766,17 +1042,21 @@ def main():
                 args.command[i],
                 host_id,
                 tag,
-                args.enable_file_logging
+                args.enable_file_logging,
+                capture_logs=not args.test_mode
             ))
         
         logger.info(f"Configured {len(collectors)} host(s) for monitoring")
-        max_points = args.max_points
+        graph_config = GraphConfig(max_points=args.max_points)
+        connect_stagger = None
+        pool_config = None
     
     if args.test_mode:
         # Test mode: just run SSH connections without GUI for specified duration
         logger.info(f"Running in test mode for {args.test_duration} seconds (SSH connections only)")
         try:
-            asyncio.run(run_ssh_collectors(collectors, test_duration=args.test_duration))
+            run_event_loop(run_ssh_collectors(collectors, test_duration=args.test_duration, connect_stagger=connect_stagger,
+                                              pool_config=pool_config))
         except KeyboardInterrupt:
             logger.info("Test mode interrupted by user")
         finally:
@@ -785,26 +1065,26 @@ def main():
             logger.info("Test mode stopped")
     else:
         # Normal mode with GUI
-        # Create the grapher
-        grapher = RealTimeGrapher(collectors, max_points)
-        
-        # Start SSH data collection in a separate thread
+        # Start SSH data collection in a separate thread first, so the SSH
+        # handshakes run in the background while the figure is being built
         def run_async_collectors():
             try:
-                asyncio.run(run_ssh_collectors(collectors))
+                run_event_loop(run_ssh_collectors(collectors, connect_stagger=connect_stagger, pool_config=pool_config))
             except KeyboardInterrupt:
                 pass
         
         ssh_thread = threading.Thread(target=run_async_collectors, daemon=True)
         ssh_thread.start()
         
+        # Create the grapher
+        grapher = RealTimeGrapher(collectors, graph_config.max_points,
+                                  graph_config.update_interval, graph_config.render_interval)
+        
         # Start real-time plotting (this will block until window is closed)
         try:
             logger.info("Starting real-time graph...")
             logger.info("TIP: Press 'S' to enable scrollback mode for detailed analysis")
-            ani = grapher.start()
-            # Keep the animation alive
-            plt.show()
+            grapher.start()
         except KeyboardInterrupt:
             logger.info("Application interrupted by user")
         finally:
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Ring buffer for per-host radar samples.
+Stores (time, distance) pairs in one preallocated NumPy record array so
+appending a sample and dropping old ones never shifts or reallocates per
+sample, and plotting can hand the columns (or reused scratch copies when the
+data wraps around) straight to matplotlib without allocating. Distances
+are kept as int16 millimetres (exact to the radar's resolution, +/-32.767 m)
+and converted back to metres when viewed. decimate() thins long views for
+plotting.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+# Stored distance units per metre, and the representable range in those units
+DISTANCE_SCALE = 1000
+DISTANCE_LIMIT = np.iinfo(np.int16).max
+
+# One record per sample: time in seconds and distance in millimetres
+SAMPLE_DTYPE = np.dtype([('time', np.float64), ('distance', np.int16)])
+
+
+class SampleRingBuffer:
+    """Circular buffer of time-ordered (time, distance) samples for one host."""
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = max(1, int(capacity))
+        self.samples = np.zeros(self.capacity, dtype=SAMPLE_DTYPE)
+        self.times = self.samples['time']  # Column views into samples
+        self.distances = self.samples['distance']
+        self._allocate_scratch()
+        self.head = 0   # Index of the oldest sample
+        self.count = 0  # Number of valid samples
+        self.first_index = 0  # Sequence number of the oldest sample (counts every sample ever added)
+        self.min_distance = None  # Cached extremes of the stored distances (None = unknown)
+        self.max_distance = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, distance: float):
+        """Add a sample (distance in metres), growing the buffer if it is full."""
+        if self.count == self.capacity:
+            self._grow()
+        index = (self.head + self.count) % self.capacity
+        stored = round(min(max(distance * DISTANCE_SCALE, -DISTANCE_LIMIT), DISTANCE_LIMIT))
+        self.samples[index] = (timestamp, stored)
+        self.count += 1
+        if self.count == 1:
+            self.min_distance = self.max_distance = stored
+        elif self.min_distance is not None:
+            if stored < self.min_distance:
+                self.min_distance = stored
+            elif stored > self.max_distance:
+                self.max_distance = stored
+
+    def extend(self, timestamps: np.ndarray, distances: np.ndarray):
+        """Add time-ordered samples in bulk (distances in metres), growing the buffer as needed."""
+        count = len(timestamps)
+        if not count:
+            return
+        while self.count + count > self.capacity:
+            self._grow()
+        stored = np.rint(np.clip(np.multiply(distances, DISTANCE_SCALE), -DISTANCE_LIMIT, DISTANCE_LIMIT))
+        # Copy in at most two slices: up to the end of the array, then from its start
+        start = (self.head + self.count) % self.capacity
+        first = min(count, self.capacity - start)
+        self.times[start:start + first] = timestamps[:first]
+        self.distances[start:start + first] = stored[:first]
+        self.times[:count - first] = timestamps[first:]
+        self.distances[:count - first] = stored[first:]
+        low, high = int(stored.min()), int(stored.max())
+        if not self.count:
+            self.min_distance, self.max_distance = low, high
+        elif self.min_distance is not None:
+            self.min_distance = min(self.min_distance, low)
+            self.max_distance = max(self.max_distance, high)
+        self.count += count
+
+    def evict_before(self, cutoff: float) -> int:
+        """Drop samples older than cutoff (samples arrive in time order); returns how many were dropped."""
+        if not self.count or self.times[self.head] >= cutoff:
+            return 0
+        # Binary search the oldest segment, then the wrapped one if it is all stale
+        end = min(self.head + self.count, self.capacity)
+        stale = int(np.searchsorted(self.times[self.head:end], cutoff, side='left'))
+        if stale == end - self.head and self.head + self.count > self.capacity:
+            wrapped = self.head + self.count - self.capacity
+            stale += int(np.searchsorted(self.times[:wrapped], cutoff, side='left'))
+        self._forget_extremes(self.head, stale)
+        self.head = (self.head + stale) % self.capacity
+        self.count -= stale
+        self.first_index += stale
+        return stale
+
+    def extrema(self) -> Optional[Tuple[float, float]]:
+        """Return (min, max) distance in metres, or None if the buffer is empty."""
+        if not self.count:
+            return None
+        if self.min_distance is None:
+            _, distances = self._raw_view()
+            self.min_distance = int(distances.min())
+            self.max_distance = int(distances.max())
+        return self.min_distance / DISTANCE_SCALE, self.max_distance / DISTANCE_SCALE
+
+    def _forget_extremes(self, start: int, length: int):
+        """Invalidate the cached extremes if they are among the samples being evicted."""
+        if self.min_distance is None:
+            return
+        end = start + length
+        segments = [self.distances[start:min(end, self.capacity)]]
+        if end > self.capacity:
+            segments.append(self.distances[:end - self.capacity])
+        for segment in segments:
+            if segment.min() <= self.min_distance or segment.max() >= self.max_distance:
+                self.min_distance = self.max_distance = None
+                return
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (times, distances in metres) in time order.
+
+        The arrays may share memory with the buffer's scratch space, so they are
+        only valid until the next call that changes or views the buffer.
+        """
+        times, distances = self._raw_view()
+        return times, np.multiply(distances, 1.0 / DISTANCE_SCALE, out=self.scaled[:self.count])
+
+    def _raw_view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the stored (times, distances) in time order; slices unless the data wraps around."""
+        samples = self._ordered()
+        return samples['time'], samples['distance']
+
+    def _ordered(self) -> np.ndarray:
+        """Return the stored records in time order; a slice unless the data wraps around."""
+        end = self.head + self.count
+        if end <= self.capacity:
+            return self.samples[self.head:end]
+        return np.concatenate((self.samples[self.head:], self.samples[:end - self.capacity]),
+                              out=self.scratch[:self.count])
+
+    def clear(self):
+        """Remove all samples."""
+        self.first_index += self.count
+        self.head = 0
+        self.count = 0
+        self.min_distance = self.max_distance = None
+
+    def _grow(self):
+        """Double the capacity, moving the samples to the front in time order."""
+        samples = self._ordered()
+        self.capacity *= 2
+        self.samples = np.zeros(self.capacity, dtype=SAMPLE_DTYPE)
+        self.samples[:self.count] = samples
+        self.times = self.samples['time']
+        self.distances = self.samples['distance']
+        self._allocate_scratch()
+        self.head = 0
+
+    def _allocate_scratch(self):
+        """Allocate the arrays reused by every view: unwrapped records and distances in metres."""
+        self.scratch = np.empty(self.capacity, dtype=SAMPLE_DTYPE)
+        self.scaled = np.empty(self.capacity, dtype=np.float32)
+
+
+def _bucket_extremes(distances: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Return the indices of the lowest and highest of distances[start:end], in order."""
+    low = start + int(distances[start:end].argmin())
+    high = start + int(distances[start:end].argmax())
+    return np.array((min(low, high), max(low, high)))
+
+
+def decimate(times: np.ndarray, distances: np.ndarray, first_index: int,
+             max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce time-ordered samples to about max_points by keeping each bucket's lowest and highest sample.
+
+    first_index is the sequence number of the first sample. Buckets are aligned
+    to multiples of a power-of-two stride in that numbering, so evicting old
+    samples doesn't change which samples are drawn, and short spikes stay visible.
+    """
+    count = len(times)
+    if count <= max_points:
+        return times, distances
+    buckets = max(1, max_points // 2 - 1)  # Two samples per bucket, one bucket spare for the partial ends
+    stride = 1 << (-(-count // buckets) - 1).bit_length()
+    lead = min(-first_index % stride, count)  # Samples before the first bucket boundary
+    full = (count - lead) // stride
+    tail = lead + full * stride
+    blocks = distances[lead:tail].reshape(full, stride)
+    offsets = lead + np.arange(full) * stride
+    low = blocks.argmin(axis=1) + offsets
+    high = blocks.argmax(axis=1) + offsets
+    parts = [np.stack((np.minimum(low, high), np.maximum(low, high)), axis=1).ravel()]
+    # The partial buckets before the first boundary and after the last one
+    if lead:
+        parts.insert(0, _bucket_extremes(distances, 0, lead))
+    if tail < count:
+        parts.append(_bucket_extremes(distances, tail, count))
+    index = np.concatenate(parts)
+    return times[index], distances[index]
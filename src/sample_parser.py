@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Parsing of radar command output.
+Samples are lines of the form "<presence> <distance>" (e.g. "1 0.652001").
+The stream is read as raw bytes in chunks and each line is split into its
+first two tokens, which are checked against the sample grammar and converted
+with int()/float(); results are memoized per distinct line, since a steady
+target repeats the same few readings. When numba is installed, chunks of at
+least SCAN_MIN_LINES lines are scanned by a compiled byte scanner instead and
+the tokenizer is only used for lines the scanner can't parse exactly. numba
+is imported and the scanner compiled on the first such chunk, so startup
+doesn't pay for them.
+"""
+
+import re
+from functools import lru_cache
+import numpy as np
+from typing import List, Optional, Tuple
+
+# Most bytes taken from the SSH stream per read (a read returns whatever is buffered, up to this)
+STDOUT_CHUNK_SIZE = 65536
+
+# Characters allowed in the presence and distance tokens; within these, int() and float()
+# accept exactly "[-+]digits" and "[-+](digits[.digits]|.digits)[e[-+]digits]"
+_PRESENCE_CHARS = b'+-0123456789'
+_DISTANCE_CHARS = b'+-.0123456789eE'
+
+# Fewest lines in a chunk for the numba scanner to beat parse_sample (typical chunks hold 1-2 lines)
+SCAN_MIN_LINES = 8
+
+# Distinct lines whose parse result is remembered
+PARSE_CACHE_SIZE = 2048
+
+# Status/initialization messages the radar prints before (or between) samples
+KNOWN_INIT_RE = re.compile(
+    rb'using alternate antenna|debugging on|spi speed|using sensitivity setting|using range min'
+    rb'|using range max|spi max speed|get status chipid|slice size|assuming|setup presence sensing'
+    rb'|get defaults|create done|chip id :',
+    re.IGNORECASE)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_sample(line: bytes) -> Optional[Tuple[int, float]]:
+    """Return (presence, distance) for a sample line, or None if it is not one.
+
+    Anything after the distance token is ignored. line must be hashable (bytes).
+    """
+    tokens = line.split(None, 2)
+    if len(tokens) < 2:
+        return None
+    presence, distance = tokens[0], tokens[1]
+    # Rejects what int()/float() would otherwise accept, such as "nan", "inf" and "1_000"
+    if presence.translate(None, _PRESENCE_CHARS) or distance.translate(None, _DISTANCE_CHARS):
+        return None
+    try:
+        return int(presence), float(distance)
+    except ValueError:
+        return None
+
+
+def split_lines(buffer: bytearray) -> List[bytes]:
+    """Remove the complete lines from the start of buffer and return them."""
+    end = buffer.rfind(b'\n')
+    if end < 0:
+        return []
+    lines = bytes(buffer[:end]).split(b'\n')
+    del buffer[:end + 1]
+    return lines
+
+
+# Scanner result per line
+_NOT_SAMPLE, _SAMPLE, _FALLBACK = 0, 1, 2
+
+# Longest digit string whose value and power of ten are exact in a float64
+_MAX_DIGITS = 15
+
+
+def _is_space(c) -> bool:
+    return c == 32 or 9 <= c <= 13
+
+
+def _scan_line(data, start, end):
+    """Parse "<presence> <distance>" from data[start:end] as (status, presence, distance).
+
+    Distances are computed as digits / 10**decimals, which is exact for up to
+    _MAX_DIGITS digits; anything longer, or with an exponent, is left to
+    parse_sample (_FALLBACK).
+    """
+    i = start
+    while i < end and _is_space(data[i]):
+        i += 1
+    negative = False
+    if i < end and (data[i] == 43 or data[i] == 45):  # '+' / '-'
+        negative = data[i] == 45
+        i += 1
+    presence = 0
+    digits = 0
+    while i < end and 48 <= data[i] <= 57:
+        presence = presence * 10 + (data[i] - 48)
+        digits += 1
+        i += 1
+    if digits == 0:
+        return _NOT_SAMPLE, 0, 0.0
+    if digits > _MAX_DIGITS:
+        return _FALLBACK, 0, 0.0
+    if negative:
+        presence = -presence
+    if i == end or not _is_space(data[i]):
+        return _NOT_SAMPLE, 0, 0.0
+    while i < end and _is_space(data[i]):
+        i += 1
+
+    negative = False
+    if i < end and (data[i] == 43 or data[i] == 45):
+        negative = data[i] == 45
+        i += 1
+    mantissa = 0
+    digits = 0
+    decimals = 0
+    while i < end and 48 <= data[i] <= 57:
+        mantissa = mantissa * 10 + (data[i] - 48)
+        digits += 1
+        i += 1
+    if i < end and data[i] == 46:  # '.'
+        i += 1
+        while i < end and 48 <= data[i] <= 57:
+            mantissa = mantissa * 10 + (data[i] - 48)
+            digits += 1
+            decimals += 1
+            i += 1
+    if digits == 0:
+        return _NOT_SAMPLE, 0, 0.0
+    if digits > _MAX_DIGITS or (i < end and (data[i] == 69 or data[i] == 101)):  # 'E' / 'e'
+        return _FALLBACK, 0, 0.0
+    if i < end and not _is_space(data[i]):
+        return _NOT_SAMPLE, 0, 0.0
+    distance = mantissa / 10.0 ** decimals
+    if negative:
+        distance = -distance
+    return _SAMPLE, presence, distance
+
+
+def _scan_block(data, status, presence, distance):
+    """Scan each newline-separated line of data into the per-line result arrays."""
+    line = 0
+    start = 0
+    n = len(data)
+    while line < len(status):
+        end = start
+        while end < n and data[end] != 10:  # '\n'
+            end += 1
+        status[line], presence[line], distance[line] = _scan_line(data, start, end)
+        line += 1
+        start = end + 1
+
+
+# Compiled _scan_block: None until first needed, False if numba isn't installed
+_compiled_scan_block = None
+
+
+def compiled_scanner():
+    """Return the numba-compiled block scanner, or None without numba (imported and compiled on first use)."""
+    global _compiled_scan_block, _is_space, _scan_line
+    if _compiled_scan_block is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _compiled_scan_block = False
+        else:
+            # The helpers are compiled first so _scan_block calls the compiled versions
+            _is_space = njit(cache=True)(_is_space)
+            _scan_line = njit(cache=True)(_scan_line)
+            _compiled_scan_block = njit(cache=True)(_scan_block)
+    return _compiled_scan_block or None
+
+
+def split_samples(buffer: bytearray) -> Tuple[List[bytes], List[Optional[Tuple[int, float]]]]:
+    """Remove the complete lines from buffer and return them with their parsed samples."""
+    end = buffer.rfind(b'\n')
+    if end < 0:
+        return [], []
+    block = bytes(buffer[:end])
+    del buffer[:end + 1]
+    lines = block.split(b'\n')
+    count = len(lines)
+    scan_block = compiled_scanner() if count >= SCAN_MIN_LINES else None
+    if scan_block is None:
+        return lines, [parse_sample(line) for line in lines]
+    status = np.empty(count, dtype=np.int8)
+    presence = np.empty(count, dtype=np.int64)
+    distance = np.empty(count, dtype=np.float64)
+    scan_block(np.frombuffer(block, dtype=np.uint8), status, presence, distance)
+
+    samples = []
+    for line, line_status, line_presence, line_distance in zip(
+            lines, status.tolist(), presence.tolist(), distance.tolist()):
+        if line_status == _SAMPLE:
+            samples.append((line_presence, line_distance))
+        elif line_status == _FALLBACK:
+            samples.append(parse_sample(line))
+        else:
+            samples.append(None)
+    return lines, samples
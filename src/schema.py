@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Typed, immutable views of the dictionary settings in config.py.
+The config loader converts GRAPH_CONFIG, SSH_POOL_CONFIG and CONNECT_STAGGER
+into these records once, so the rest of the program reads plain attributes.
+"""
+
+import logging
+from numbers import Real
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class GraphConfig(NamedTuple):
+    """Graph settings (GRAPH_CONFIG)."""
+    max_points: int = 100                 # Initial per-host sample buffer size
+    update_interval: int = 100            # Data ingest interval in milliseconds
+    render_interval: int = 200            # Minimum redraw interval in milliseconds
+    window_size: Tuple[int, int] = (12, 6)  # Graph window size (width, height)
+
+
+class SSHPoolConfig(NamedTuple):
+    """SSH connection pool settings (SSH_POOL_CONFIG)."""
+    max_per_host: int = 4                 # Idle connections kept per (host, username, port)
+    max_sessions_per_conn: int = 8        # Concurrent command sessions per connection
+    idle_timeout: float = 300             # Seconds an idle connection is kept before closing
+    keepalive: float = 30                 # SSH keepalive interval in seconds
+    keepalive_count_max: int = 3          # Unanswered keepalives before a connection is dropped
+    rcvbuf: Optional[int] = None          # TCP receive buffer in bytes (None = kernel autotuning)
+
+
+class ConnectStagger(NamedTuple):
+    """Initial connect spacing (CONNECT_STAGGER): host i waits i * base + random(0, jitter) seconds."""
+    base: float = 0.0                     # Seconds between consecutive host connects
+    jitter: float = 0.0                   # Random extra delay to avoid synchronized connects
+
+
+# Type and smallest accepted value of each numeric setting ('optional' settings may also be None)
+FIELD_RULES = {
+    GraphConfig: {
+        'max_points': (int, 1),
+        'update_interval': (int, 1),
+        'render_interval': (int, 1),
+    },
+    SSHPoolConfig: {
+        'max_per_host': (int, 0),
+        'max_sessions_per_conn': (int, 1),
+        'idle_timeout': (Real, 0),
+        'keepalive': (Real, 0),             # 0 disables keepalives
+        'keepalive_count_max': (int, 1),
+        'rcvbuf': (int, 1, 'optional'),
+    },
+    ConnectStagger: {
+        'base': (Real, 0),
+        'jitter': (Real, 0),
+    },
+}
+
+
+def check_number(value, kind, minimum: float, label: str, optional: bool = False):
+    """Raise ValueError unless value is a kind (int or Real) of at least minimum."""
+    if value is None and optional:
+        return
+    if isinstance(value, bool) or not isinstance(value, kind) or value != value:
+        expected = 'an integer' if kind is int else 'a number'
+        raise ValueError(f"{label} must be {expected}, got {value!r}")
+    if value < minimum:
+        raise ValueError(f"{label} must be at least {minimum}, got {value!r}")
+
+
+def validate_record(record, name: str):
+    """Check every field of a settings record against FIELD_RULES, raising ValueError on the first problem."""
+    for field, rule in FIELD_RULES.get(type(record), {}).items():
+        kind, minimum, *optional = rule
+        check_number(getattr(record, field), kind, minimum, f"{name}['{field}']", bool(optional))
+    if isinstance(record, GraphConfig):
+        size = record.window_size
+        if not isinstance(size, (tuple, list)) or len(size) != 2:
+            raise ValueError(f"{name}['window_size'] must be a (width, height) pair, got {size!r}")
+        for value in size:
+            check_number(value, Real, 1, f"{name}['window_size']")
+
+
+def from_dict(record_type, settings: dict, name: str):
+    """Build record_type from a settings dict, validating each field.
+
+    Unknown keys are ignored with a warning, so settings meant for other
+    versions of the program don't stop it from starting.
+    """
+    settings = dict(settings or {})
+    unknown = sorted(set(settings) - set(record_type._fields))
+    if unknown:
+        logger.warning(f"Ignoring unknown {name} setting(s): {', '.join(unknown)}")
+        for key in unknown:
+            del settings[key]
+    record = record_type(**settings)
+    validate_record(record, name)
+    return record
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Persistent SSH connection pool for radar distance monitoring.
+Connections are keyed by (host, username, port) so that every command
+session started against the same host reuses one authenticated transport
+instead of paying the TCP handshake, key exchange and login again. A
+checked-out connection is shared by every checkout for the same key until
+its sessions reach max_sessions_per_conn; it returns to the idle list when
+the last one ends.
+"""
+
+import asyncio
+import asyncssh
+import os
+import socket
+import threading
+import time
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Tuple
+
+from schema import SSHPoolConfig, validate_record
+
+logger = logging.getLogger(__name__)
+
+_pool_config = SSHPoolConfig()
+_idle: Dict[Tuple[str, str, int], Deque[Tuple[asyncssh.SSHClientConnection, float]]] = {}
+_options: Dict[Tuple[str, str, int], asyncssh.SSHClientConnectionOptions] = {}
+# Checked-out connections per key, with the number of sessions reserved on each
+_in_use: Dict[Tuple[str, str, int], Dict[asyncssh.SSHClientConnection, int]] = {}
+_connect_locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+_lock = threading.Lock()
+
+
+def configure(pool_config: SSHPoolConfig = None):
+    """Use the given pool settings (defaults when None), raising ValueError if one is out of range."""
+    global _pool_config
+    pool_config = pool_config or SSHPoolConfig()
+    validate_record(pool_config, 'SSH_POOL_CONFIG')
+    _pool_config = pool_config
+    _options.clear()  # Built from the pool settings
+
+
+def session_limit() -> int:
+    """Return how many command sessions may share one pooled connection."""
+    return max(1, int(_pool_config.max_sessions_per_conn))
+
+
+def keepalive_enabled() -> bool:
+    """Return whether keepalives (and the idle-connection heartbeat) are on; keepalive = 0 turns them off."""
+    return _pool_config.keepalive > 0
+
+
+def pool_key(host_config: dict) -> Tuple[str, str, int]:
+    """Return the key that identifies a reusable connection for a host entry."""
+    return (host_config['host'], host_config['username'], host_config.get('port', 22))
+
+
+def _connection_options(host_config: dict) -> asyncssh.SSHClientConnectionOptions:
+    """Return the connection options for a host entry, built (and key files loaded) once per pool key.
+
+    A configured key_filename is tried first (after any agent keys), with the
+    password as a fallback; without one, the default ~/.ssh keys are tried.
+    """
+    key = pool_key(host_config)
+    options = _options.get(key)
+    if options is None:
+        key_filename = host_config.get('key_filename')
+        options = asyncssh.SSHClientConnectionOptions(
+            username=key[1],
+            password=host_config.get('password'),
+            client_keys=[os.path.expanduser(key_filename)] if key_filename else (),
+            passphrase=host_config.get('key_passphrase'),
+            known_hosts=None,  # Accept any host key (use with caution)
+            keepalive_interval=_pool_config.keepalive,
+            keepalive_count_max=_pool_config.keepalive_count_max,
+            request_pty=True  # Request PTY at connection level
+        )
+        _options[key] = options
+    return options
+
+
+async def _connect(host_config: dict) -> asyncssh.SSHClientConnection:
+    """Open a new SSH connection for a host entry."""
+    host, username, port = pool_key(host_config)
+    conn = await asyncssh.connect(host, port=port, options=_connection_options(host_config))
+    _tune_socket(conn)
+    logger.debug(f"Opened pooled SSH connection to {username}@{host}:{port}")
+    return conn
+
+
+def _tune_socket(conn: asyncssh.SSHClientConnection):
+    """Apply the configured receive buffer size (asyncio already sets TCP_NODELAY)."""
+    if not _pool_config.rcvbuf:
+        return
+    sock = conn.get_extra_info('socket')
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, int(_pool_config.rcvbuf))
+    except OSError as e:
+        logger.debug(f"Could not set socket options: {e}")
+
+
+def _checkout_idle(key: Tuple[str, str, int]):
+    """Take the most recently used live connection for key, or None."""
+    now = time.monotonic()
+    with _lock:
+        idle = _idle.get(key)
+        while idle:
+            conn, released_at = idle.pop()
+            if conn.is_closed():
+                continue
+            if now - released_at > _pool_config.idle_timeout:
+                conn.close()
+                continue
+            return conn
+    return None
+
+
+def _checkin(key: Tuple[str, str, int], conn: asyncssh.SSHClientConnection):
+    """Return a connection to the pool, closing it if the pool is full."""
+    if conn.is_closed():
+        return
+    with _lock:
+        idle = _idle.setdefault(key, deque())
+        if len(idle) < _pool_config.max_per_host:
+            idle.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+
+def _share_in_use(key: Tuple[str, str, int], sessions: int):
+    """Reserve sessions on a checked-out connection for key that has room for them, or return None."""
+    limit = session_limit()
+    with _lock:
+        in_use = _in_use.get(key, {})
+        for conn, reserved in in_use.items():
+            if not conn.is_closed() and reserved + sessions <= limit:
+                in_use[conn] = reserved + sessions
+                return conn
+    return None
+
+
+def _release(key: Tuple[str, str, int], conn: asyncssh.SSHClientConnection, sessions: int):
+    """Give back reserved sessions, checking the connection in once none are left."""
+    with _lock:
+        in_use = _in_use[key]
+        in_use[conn] -= sessions
+        if in_use[conn] > 0:
+            return
+        del in_use[conn]
+    _checkin(key, conn)
+
+
+@asynccontextmanager
+async def get_client(host_config: dict, sessions: int = 1):
+    """Check out a live SSH connection for host_config with room for sessions command sessions.
+
+    The connection is shared with other checkouts for the same key while the
+    reserved sessions fit within session_limit(); sessions is capped at it.
+    """
+    key = pool_key(host_config)
+    sessions = min(max(1, sessions), session_limit())
+    conn = _share_in_use(key, sessions)
+    if conn is None:
+        # One connect per key at a time, so concurrent checkouts share it rather than each opening one
+        lock = _connect_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            conn = _share_in_use(key, sessions)
+            if conn is None:
+                conn = _checkout_idle(key) or await _connect(host_config)
+                with _lock:
+                    _in_use.setdefault(key, {})[conn] = sessions
+    try:
+        yield conn
+    finally:
+        _release(key, conn, sessions)
+
+
+def prune_idle():
+    """Probe idle connections with a cheap debug packet and drop dead or expired ones."""
+    now = time.monotonic()
+    with _lock:
+        for idle in _idle.values():
+            alive = deque()
+            for conn, released_at in idle:
+                if conn.is_closed():
+                    continue
+                if now - released_at > _pool_config.idle_timeout:
+                    conn.close()
+                    continue
+                try:
+                    conn.send_debug('keepalive')
+                except (OSError, asyncssh.Error) as e:
+                    logger.debug(f"Dropping dead pooled SSH connection: {e}")
+                    conn.close()
+                    continue
+                alive.append((conn, released_at))
+            idle.clear()
+            idle.extend(alive)
+
+
+async def heartbeat():
+    """Periodically prune idle connections so checkouts don't stall on a dead transport."""
+    if not keepalive_enabled():
+        return
+    while True:
+        await asyncio.sleep(_pool_config.keepalive)
+        prune_idle()
+
+
+async def close_all():
+    """Close every idle pooled connection."""
+    with _lock:
+        conns = [conn for idle in _idle.values() for conn, _ in idle]
+        _idle.clear()
+    _connect_locks.clear()  # Bound to the event loop that is finishing
+    for conn in conns:
+        conn.close()
+    for conn in conns:
+        try:
+            await conn.wait_closed()
+        except Exception:
+            pass